@@ -1,11 +1,13 @@
 
 import os
+import re
 import sys
 import cmd
 import shlex
 import json
 from typing import Optional, List
 from pathlib import Path
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from rich.console import Console
@@ -17,8 +19,6 @@ from prompt_toolkit.history import FileHistory
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.document import Document
 from prompt_toolkit.formatted_text import HTML
-import sqlglot
-from sqlglot import exp
 
 # Load environment variables
 load_dotenv()
@@ -26,15 +26,247 @@ load_dotenv()
 # Initialize Rich Console
 console = Console()
 
+# JSON loader for script files: orjson (optional) is much faster on large files
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_binary = True
+except ImportError:
+    _json_loads = json.loads
+    _json_binary = False
+
+# Precompiled patterns (used on every keystroke / query retry)
+_FROM_RE = re.compile(r'from\s+(\w+)')
+_NULL_FILTER_RE = re.compile(r'([\w_]+):!=null')
+
+@lru_cache(maxsize=None)
+def _where_maps():
+    """Return (exp, op_map, bool_map): sqlglot's expressions module plus the
+    SQL operator -> Typesense filter_by syntax maps (using := for exact match in TS).
+
+    Built on first use because sqlglot is only imported once SQL is run.
+    """
+    from sqlglot import exp
+    op_map = {
+        exp.EQ: ':=',
+        exp.GT: ':>',
+        exp.LT: ':<',
+        exp.GTE: ':>=',
+        exp.LTE: ':<=',
+        exp.NEQ: ':!=',
+    }
+    bool_map = {
+        exp.And: ' && ',
+        exp.Or: ' || ',
+    }
+    return exp, op_map, bool_map
+
+def _transpile_where(node):
+    """Recursively translate SQLGlot expression to Typesense filter_by string."""
+    
+    # Handle binary operations: EQ, GT, LT, etc.
+    # Typesense: field:value, field:>value, field:[v1..v2]
+    op = type(node)
+    exp, op_map, bool_map = _where_maps()
+
+    # Comparison Operators
+    # node.left is usually column, node.right is value
+    if op in op_map:
+        return f"{node.left.name}{op_map[op]}{node.right.name}"
+
+    if op in bool_map:
+        return f"({_transpile_where(node.left)}){bool_map[op]}({_transpile_where(node.right)})"
+        
+    if isinstance(node, exp.Like):
+        # rudimentary LIKE support
+        # LIKE 'term' -> field:term (text match)
+        # LIKE '%term%' -> unsupported direct mapping in filter_by, usually 'q' param, 
+        # but here we are in filter_by context. 
+        # Typesense filter_by supports field:value for exact or string match.
+        return f"{node.this.name}:{node.expression.this}"
+
+    if isinstance(node, exp.Is):
+        # Handle IS NULL / IS NOT NULL
+        # node.this is the field
+        # node.expression is Null()
+        if isinstance(node.expression, exp.Null):
+            # Standard SQLGlot IS parser often keeps the NOT in parent structure or as a flag?
+            # Actually, sqlglot parses "x IS NOT NULL" as Not(Is(x, Null)).
+            # So we might encounter Is(x, Null) here.
+            return f"{node.this.name}:=null"
+    
+    if isinstance(node, exp.Not):
+        # Handle NOT (...)
+        # Specifically check for IS NULL inside NOT -> IS NOT NULL
+        if isinstance(node.this, exp.Is) and isinstance(node.this.expression, exp.Null):
+             return f"{node.this.this.name}:!=null"
+        # Generic NOT mapping if possible, though TS uses negation differently often
+        # return f"!({_transpile_where(node.this)})" 
+        # TS doesn't strictly have !(expression) syntax in filter_by, usually operators.
+        # But let's try the IS NOT NULL case specifically as requested.
+        
+    raise ValueError(f"Unsupported WHERE clause operator: {type(node)}")
+
+class SQLParseError(Exception):
+    """Raised when sqlglot cannot parse a query."""
+
+class UnsupportedQueryError(Exception):
+    """Raised for parsed statements tscli cannot run (anything but SELECT)."""
+
+@lru_cache(maxsize=128)
+def _translate(sql_query):
+    """Translate a SELECT statement into Typesense search parameters.
+
+    Returns (collection_name, query_params, include_fields, is_star); collection_name
+    is None when the query has no FROM clause. Results are memoized, so callers
+    must copy query_params before mutating it.
+    """
+    # sqlglot is heavy to import; defer it until the first query
+    import sqlglot
+    from sqlglot import exp
+
+    try:
+        parsed = sqlglot.parse_one(sql_query)
+    except Exception as e:
+        raise SQLParseError(e) from e
+
+    if not isinstance(parsed, exp.Select):
+        raise UnsupportedQueryError("Only SELECT statements are supported.")
+
+    # 1. Determine Collection (FROM table)
+    collection_name = None
+    from_expressions = parsed.find_all(exp.Table)
+    for table in from_expressions:
+        collection_name = table.name
+        break # Only support single table for now
+
+    # 2. Select Fields (SELECT ...)
+    include_fields = []
+    is_star = False
+    for expression in parsed.expressions:
+        if isinstance(expression, exp.Star):
+            is_star = True
+            break
+        # Handle standard identifiers
+        if isinstance(expression, exp.Column):
+             include_fields.append(expression.name)
+        # Handle Alias? Not supported in TS directly but we collect names
+        
+    query_params = {
+        'q': '*',
+        'per_page': 10,
+        'page': 1
+    }
+    
+    if not is_star and include_fields:
+        query_params['include_fields'] = ",".join(include_fields)
+
+    # 3. WHERE Clause -> filter_by
+    # This is the tricky part. Need to translate SQL expression to TS filter string.
+    # Simple recursion for basic operators. Raises ValueError if unsupported.
+    where = parsed.find(exp.Where)
+    if where:
+        ts_filter = _transpile_where(where.this)
+        if ts_filter:
+            query_params['filter_by'] = ts_filter
+
+    # 4. ORDER BY
+    order = parsed.find(exp.Order)
+    if order:
+        sort_parts = []
+        for ordered in order.expressions:
+            field = ordered.this.name
+            direction = "desc" if ordered.args.get('desc') else "asc"
+            sort_parts.append(f"{field}:{direction}")
+        if sort_parts:
+            query_params['sort_by'] = ",".join(sort_parts)
+
+    # 5. LIMIT
+    limit = parsed.find(exp.Limit)
+    if limit:
+        try:
+            query_params['per_page'] = int(limit.expression.this)
+        except:
+            pass
+
+    return collection_name, query_params, tuple(include_fields), is_star
+
+# Result sets with at least this many rows are drawn with box.SIMPLE
+SIMPLE_BOX_THRESHOLD = 50
+
+# Max searches Typesense accepts in one multi_search request (server default)
+MULTI_SEARCH_LIMIT = 50
+
+class TrieNode:
+    """A node in the prefix trie used for autocomplete."""
+    def __init__(self):
+        self.children = {} # dict mapping char -> TrieNode
+        self.entries = [] # list of (display string, display meta) ending here
+
+class Trie:
+    """Prefix trie mapping keys to completion entries."""
+    def __init__(self, ignore_case: bool = True):
+        self.root = TrieNode()
+        self.ignore_case = ignore_case
+
+    def insert(self, key: str, entry: tuple):
+        """Insert entry under key (lowercased if ignore_case); entry keeps the original case."""
+        node = self.root
+        for ch in (key.lower() if self.ignore_case else key):
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = TrieNode()
+            node = child
+        node.entries.append(entry)
+
+    def find(self, prefix: str) -> Optional[TrieNode]:
+        """Walk prefix (already lowercased by the caller if needed); None if absent."""
+        node = self.root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+
+    def collect(self, node: TrieNode, out: list):
+        """Depth-first gather of every entry under node."""
+        out.extend(node.entries)
+        for child in node.children.values():
+            self.collect(child, out)
+
+    def complete(self, prefix: str) -> list:
+        """Return every entry whose key starts with prefix."""
+        out = []
+        node = self.find(prefix)
+        if node is not None:
+            self.collect(node, out)
+        return out
+
 class SQLCompleter(Completer):
     def __init__(self, tables: List[str], columns: dict):
-        self.tables = tables
-        self.columns = columns # dict mapping table -> list of columns
         self.keywords = [
             'SELECT', 'FROM', 'WHERE', 'ORDER BY', 'LIMIT', 'OFFSET',
             'AND', 'OR', 'NOT', 'IN', 'LIKE', 'NULL', 'DESC', 'ASC'
         ]
-        self.meta_commands = [r'\l', r'\c', r'\d', r'\s', r'\?', r'\q', r'\i']
+        self.meta_commands = (r'\l', r'\c', r'\d', r'\s', r'\?', r'\q', r'\i')
+        # Meta commands are matched verbatim
+        self.meta_trie = Trie(ignore_case=False)
+        for cmd in self.meta_commands:
+            self.meta_trie.insert(cmd, (cmd, None))
+        self.set_metadata(tables, columns)
+
+    def set_metadata(self, tables: List[str], columns: dict):
+        """Replace known tables/columns and rebuild the completion trie."""
+        self.tables = tables
+        self.columns = columns # dict mapping column -> list of tables it appears in
+
+        self.trie = Trie()
+        for keyword in self.keywords:
+            self.trie.insert(keyword, (keyword, 'Keyword'))
+        for table in self.tables:
+            self.trie.insert(table, (table, 'Collection'))
+        for col, col_tables in self.columns.items():
+            self.trie.insert(col, (col, f'Field ({", ".join(col_tables)})'))
 
     def get_completions(self, document: Document, complete_event):
         text_before_cursor = document.text_before_cursor
@@ -42,34 +274,26 @@ class SQLCompleter(Completer):
         
         # Check if we are typing a meta command
         if text_before_cursor.strip().startswith('\\'):
-             for cmd in self.meta_commands:
-                 if cmd.startswith(word_before_cursor):
-                     yield Completion(cmd, start_position=-len(word_before_cursor))
+             for cmd, meta in self.meta_trie.complete(word_before_cursor):
+                 yield Completion(cmd, start_position=-len(word_before_cursor), display_meta=meta)
              return
 
-        # Simple SQL Completion
-        
-        # 1. Keywords (always available)
-        for keyword in self.keywords:
-            if keyword.lower().startswith(word_before_cursor.lower()):
-                yield Completion(keyword, start_position=-len(word_before_cursor), display_meta='Keyword')
+        # Nothing typed yet (e.g. right after a space): an empty prefix would
+        # match every identifier in the trie, so don't offer anything.
+        if not word_before_cursor:
+            return
 
-        # 2. Tables (Collections)
-        # Suggest tables if last keyword was FROM or usually at start of queries context
-        # For simplicity, we just add them to completions
-        for table in self.tables:
-             if table.startswith(word_before_cursor):
-                 yield Completion(table, start_position=-len(word_before_cursor), display_meta='Collection')
+        # Simple SQL Completion
+        # Keywords, tables (collections) and columns (fields) all live in one trie,
+        # so we only walk len(word) nodes and then enumerate the matching subtree.
 
-        # 3. Columns (Fields)
         # Attempt to find the table context. 
         # Very basic check: "FROM table_name"
         found_table = None
         lower_text = text_before_cursor.lower()
         
         # Look for the last "from" word
-        import re
-        match = re.search(r'from\s+(\w+)', lower_text)
+        match = _FROM_RE.search(lower_text)
         if match:
             found_table = match.group(1)
             # Try to match case from our known tables
@@ -85,13 +309,11 @@ class SQLCompleter(Completer):
              # For now, let's just complete columns if we can.
              pass
 
-        # Add all columns from all tables for now (simplification)
+        # Complete against all keywords, tables and columns for now (simplification)
         # Or context-aware if we parsed. 
-        for table_name, cols in self.columns.items():
-             for col in cols:
-                 if col.startswith(word_before_cursor):
-                     # Add table info to display
-                     yield Completion(col, start_position=-len(word_before_cursor), display_meta=f'Field ({table_name})')
+        wbc = word_before_cursor.lower()
+        for entry, meta in self.trie.complete(wbc):
+            yield Completion(entry, start_position=-len(word_before_cursor), display_meta=meta)
 
 class TypesenseCLI:
     def __init__(self):
@@ -114,8 +336,8 @@ class TypesenseCLI:
                 'api_key': self.api_key,
                 'connection_timeout_seconds': 2
             })
-            # Verify connection
-            self.client.collections.retrieve()
+            # Verify connection (the collection list is reused for metadata below)
+            cols = self.client.collections.retrieve()
             console.print(f"[bold green]Connected to Typesense at {self.host}:{self.port}[/bold green]")
         except Exception as e:
             console.print(f"[bold red]Connection failed:[/bold red] {e}")
@@ -125,28 +347,50 @@ class TypesenseCLI:
         
         # Metadata for autocomplete
         self.available_collections = []
+        self._collections_set = set() # available_collections, for O(1) existence checks
         self.collection_fields = {} # Map collection -> list of fields
-        self.refresh_metadata()
+        self.column_to_tables = {} # Map field -> list of collections containing it
+        self.refresh_metadata(cols)
 
-        self.completer = SQLCompleter(self.available_collections, self.collection_fields)
+        self.completer = SQLCompleter(self.available_collections, self.column_to_tables)
         self.session = PromptSession(
             history=FileHistory('.tscli_history'),
             completer=self.completer
         )
 
-    def refresh_metadata(self):
-        """Fetch collections and fields for autocomplete."""
+        # Meta command -> handler taking the list of arguments
+        self._meta_dispatch = {
+            r'\q': lambda args: self.do_quit(),
+            r'\l': lambda args: self.do_list(),
+            r'\c': lambda args: self.do_connect(args[0] if args else None),
+            r'\d': lambda args: self.do_describe(args[0] if args else None),
+            r'\s': lambda args: self.do_stats(args[0] if args else None),
+            r'\stats': lambda args: self.do_stats(args[0] if args else None),
+            r'\?': lambda args: self.do_help(),
+            r'\i': lambda args: self.execute_file(args[0] if args else None),
+        }
+
+    def refresh_metadata(self, cols=None):
+        """Fetch collections and fields for autocomplete.
+
+        cols can be an already retrieved collection list to avoid a second request.
+        """
         try:
-            cols = self.client.collections.retrieve()
+            if cols is None:
+                cols = self.client.collections.retrieve()
             self.available_collections = [c['name'] for c in cols]
+            self._collections_set = set(self.available_collections)
             self.collection_fields = {}
+            self.column_to_tables = {}
             for c in cols:
-                self.collection_fields[c['name']] = [f['name'] for f in c.get('fields', [])]
+                # Skip wildcard (auto-schema) entries like '.*'; they are not real fields
+                self.collection_fields[c['name']] = [f['name'] for f in c.get('fields', []) if '*' not in f['name']]
+                for fn in self.collection_fields[c['name']]:
+                    self.column_to_tables.setdefault(fn, []).append(c['name'])
             
             # Update completer if it exists
             if hasattr(self, 'completer'):
-                self.completer.tables = self.available_collections
-                self.completer.columns = self.collection_fields
+                self.completer.set_metadata(self.available_collections, self.column_to_tables)
                 
         except Exception:
             pass # Silent fail during init
@@ -156,6 +400,11 @@ class TypesenseCLI:
             return HTML(f'<ansigreen>tscli</ansigreen> (<ansiyellow>{self.current_collection}</ansiyellow>)> ')
         return HTML('<ansigreen>tscli</ansigreen>> ')
 
+    def do_quit(self):
+        """Quit the shell."""
+        console.print("Bye!")
+        sys.exit(0)
+
     def do_list(self):
         """List all available collections."""
         try:
@@ -181,13 +430,20 @@ class TypesenseCLI:
             console.print(r"[yellow]Usage: \c [collection][/yellow]")
             return
 
-        try:
-            # check if collection exists
-            self.client.collections[collection_name].retrieve()
-            self.current_collection = collection_name
-            console.print(f"You are now connected to collection [bold cyan]{collection_name}[/bold cyan].")
-        except Exception:
-             console.print(f"[bold red]Collection '{collection_name}' does not exist.[/bold red]")
+        # check if collection exists; known names skip the server round-trip.
+        # Otherwise ask the server, which also resolves aliases.
+        if collection_name not in self._collections_set:
+            try:
+                info = self.client.collections[collection_name].retrieve()
+            except Exception:
+                 console.print(f"[bold red]Collection '{collection_name}' does not exist.[/bold red]")
+                 return
+            # A collection created since the last refresh: pick it up for autocomplete
+            if info.get('name') not in self._collections_set:
+                self.refresh_metadata()
+
+        self.current_collection = collection_name
+        console.print(f"You are now connected to collection [bold cyan]{collection_name}[/bold cyan].")
 
     def do_describe(self, collection_name=None):
         """Describe a collection."""
@@ -246,42 +502,23 @@ class TypesenseCLI:
             table.add_column("Count", style="magenta")
             table.add_column("Percentage", style="green")
 
+            fields = info.get('fields', [])
+            # Only optional + indexed fields need a search
+            targets = [f for f in fields if f.get('optional', False) and f.get('index', True)]
+
             with console.status(f"[bold green]Calculating statistics for {target_col}...[/bold green]"):
-                for field in info.get('fields', []):
+                counts = self._count_fields(target_col, targets)
+
+                for field in fields:
                     field_name = field.get('name', '')
-                    is_optional = field.get('optional', False)
-                    is_indexed = field.get('index', True)
                     
-                    count = 0
-                    if not is_optional:
+                    if not field.get('optional', False):
                         # Non-optional fields are present in all documents
                         count = total_docs
-                    elif not is_indexed:
+                    elif not field.get('index', True):
                         count = "N/A (Not Indexed)"
                     else:
-                        try:
-                            # Attempt 1: Standard existence check
-                            search_results = self.client.collections[target_col].documents.search({
-                                'q': '*',
-                                'filter_by': f'{field_name}:!=null',
-                                'per_page': 0
-                            })
-                            count = search_results.get('found', 0)
-                        except Exception as e:
-                             # Fallback for numeric fields if !=null fails (common in some TS versions or configs)
-                            if field.get('type') in ['int32', 'int64', 'float']:
-                                try:
-                                    # Try range query covering most values
-                                    search_results = self.client.collections[target_col].documents.search({
-                                        'q': '*',
-                                        'filter_by': f'{field_name}:>= -2000000000', # Covers most standard usage
-                                        'per_page': 0
-                                    })
-                                    count = search_results.get('found', 0)
-                                except Exception:
-                                     count = f"Err: {str(e)[:20]}"
-                            else:
-                                count = f"Err: {str(e)[:20]}"
+                        count = counts.get(field_name, "Err: no result")
 
                     percentage = "N/A"
                     if isinstance(count, int):
@@ -298,6 +535,56 @@ class TypesenseCLI:
         except Exception as e:
             console.print(f"[bold red]Error getting stats for '{target_col}':[/bold red] {e}")
 
+    def _count_fields(self, collection_name, fields):
+        """Count documents where each field is present, batched via multi_search.
+
+        Fields whose search fails (or gets no result back) map to an "Err: ..." string.
+        """
+        counts = {}
+        # Typesense caps the number of searches per multi_search request (default 50)
+        for i in range(0, len(fields), MULTI_SEARCH_LIMIT):
+            batch = fields[i:i + MULTI_SEARCH_LIMIT]
+
+            # Attempt 1: Standard existence check
+            results = self._multi_search_counts(collection_name, batch, ':!=null')
+
+            retry = []
+            for field, result in zip(batch, results):
+                if 'error' not in result:
+                    counts[field['name']] = result.get('found', 0)
+                    continue
+                counts[field['name']] = f"Err: {str(result['error'])[:20]}"
+                # Fallback for numeric fields if !=null fails (common in some TS versions or configs)
+                if field.get('type') in ['int32', 'int64', 'float']:
+                    retry.append(field)
+
+            if retry:
+                # Try range query covering most values
+                results = self._multi_search_counts(collection_name, retry, ':>= -2000000000') # Covers most standard usage
+                for field, result in zip(retry, results):
+                    if 'error' not in result:
+                        counts[field['name']] = result.get('found', 0)
+
+        return counts
+
+    def _multi_search_counts(self, collection_name, fields, condition):
+        """Run one `field<condition>` count per field in a single multi_search.
+
+        Always returns one result per field; a failed request or a missing result
+        becomes {'error': ...} for the affected fields.
+        """
+        searches = [{
+            'collection': collection_name,
+            'q': '*',
+            'filter_by': f"{f['name']}{condition}",
+            'per_page': 0
+        } for f in fields]
+        try:
+            results = self.client.multi_search.perform({'searches': searches}, {}).get('results', [])
+        except Exception as e:
+            return [{'error': e}] * len(fields)
+        return results[:len(fields)] + [{'error': 'no result'}] * (len(fields) - len(results))
+
     def do_help(self):
         """Display help information."""
         table = Table(title="Meta Commands", box=box.ROUNDED)
@@ -318,110 +605,29 @@ class TypesenseCLI:
     def execute_sql(self, sql_query):
         """Translate SQL to Typesense query and execute."""
         try:
-            parsed = sqlglot.parse_one(sql_query)
-        except Exception as e:
+            collection_name, query_params, include_fields, is_star = _translate(sql_query)
+        except SQLParseError as e:
              console.print(f"[bold red]SQL Parse Error:[/bold red] {e}")
              return
-
-        if not isinstance(parsed, exp.Select):
-             console.print("[yellow]Only SELECT statements are supported.[/yellow]")
+        except UnsupportedQueryError as e:
+             console.print(f"[yellow]{e}[/yellow]")
+             return
+        except ValueError as ve:
+             console.print(f"[bold red]Translation Error:[/bold red] {ve}")
              return
 
-        # 1. Determine Collection (FROM table)
-        collection_name = self.current_collection
-        from_expressions = parsed.find_all(exp.Table)
-        for table in from_expressions:
-            collection_name = table.name
-            break # Only support single table for now
-            
+        # The translation is cached; copy before filling in / mutating params
+        query_params = dict(query_params)
+        collection_name = collection_name or self.current_collection
         if not collection_name:
              console.print("[bold red]Error:[/bold red] No collection specified. Use FROM [collection] or connect using \c.")
              return
 
-        # 2. Select Fields (SELECT ...)
-        include_fields = []
-        is_star = False
-        for expression in parsed.expressions:
-            if isinstance(expression, exp.Star):
-                is_star = True
-                break
-            # Handle standard identifiers
-            if isinstance(expression, exp.Column):
-                 include_fields.append(expression.name)
-            # Handle Alias? Not supported in TS directly but we collect names
-            
-        query_params = {
-            'q': '*',
-            'per_page': 10,
-            'page': 1
-        }
-        
-        if not is_star and include_fields:
-            query_params['include_fields'] = ",".join(include_fields)
-
-        # 3. WHERE Clause -> filter_by
-        # This is the tricky part. Need to translate SQL expression to TS filter string.
-        # Simple recursion for basic operators.
-        where = parsed.find(exp.Where)
-        if where:
-            try:
-                ts_filter = self._transpile_where(where.this)
-                if ts_filter:
-                    query_params['filter_by'] = ts_filter
-            except ValueError as ve:
-                 console.print(f"[bold red]Translation Error:[/bold red] {ve}")
-                 return
-
-        # 4. ORDER BY
-        order = parsed.find(exp.Order)
-        if order:
-            sort_parts = []
-            for ordered in order.expressions:
-                field = ordered.this.name
-                direction = "desc" if ordered.args.get('desc') else "asc"
-                sort_parts.append(f"{field}:{direction}")
-            if sort_parts:
-                query_params['sort_by'] = ",".join(sort_parts)
-
-        # 5. LIMIT
-        limit = parsed.find(exp.Limit)
-        if limit:
-            try:
-                query_params['per_page'] = int(limit.expression.this)
-            except:
-                pass
-        
-        
         # Execute Query
         try:
             console.print(f"[dim]Executing against '{collection_name}': {query_params}[/dim]")
             results = self.client.collections[collection_name].documents.search(query_params)
-            
-            hits = results.get('hits', [])
-            if not hits:
-                console.print("[yellow]No results found.[/yellow]")
-                return
-
-            # Dynamic Table
-            # Determine columns to show
-            if not hits:
-                 return
-                 
-            # If explicit fields requested, use them. Else use all from first hit.
-            first_doc = hits[0]['document']
-            columns_to_show = include_fields if (include_fields and not is_star) else list(first_doc.keys())
-            
-            table = Table(box=box.ROUNDED)
-            for col in columns_to_show:
-                table.add_column(col, style="cyan")
-                
-            for hit in hits:
-                doc = hit['document']
-                row = [str(doc.get(col, '')) for col in columns_to_show]
-                table.add_row(*row)
-                
-            console.print(table)
-            console.print(f"[dim]Found {results.get('found', 0)} hits in {results.get('search_time_ms', 0)}ms[/dim]")
+            self._render_results(results, include_fields, is_star, collection_name)
             
         except Exception as e:
             # Automatic fallback for IS NOT NULL on numeric fields if "Not an int32" error occurs
@@ -431,12 +637,13 @@ class TypesenseCLI:
                  console.print("[yellow]Numeric field detected, retrying with range query...[/yellow]")
                  # We need to find which field caused it, or just blindly replace ALL :!=null with range?
                  # Safer: simple regex replace field:!=null -> field:>= -2000000000
-                 import re
                  # This regex finds `field:!=null` and replaces with range
-                 new_filter = re.sub(r'([\w_]+):!=null', r'\1:>= -2000000000', query_params['filter_by'])
+                 new_filter = _NULL_FILTER_RE.sub(r'\1:>= -2000000000', query_params['filter_by'])
                  query_params['filter_by'] = new_filter
                  try:
-                     self.execute_sql_params(collection_name, query_params, include_fields, is_star)
+                     console.print(f"[dim]Executing against '{collection_name}': {query_params}[/dim]")
+                     results = self.client.collections[collection_name].documents.search(query_params)
+                     self._render_results(results, include_fields, is_star, collection_name)
                      return
                  except Exception as e2:
                      console.print(f"[bold red]Retry Failed:[/bold red] {e2}")
@@ -448,90 +655,41 @@ class TypesenseCLI:
 
             console.print(f"[bold red]Query Error:[/bold red] {msg}")
 
-    def execute_sql_params(self, collection_name, query_params, include_fields, is_star):
-        """Helper to re-run execution logic"""
-        console.print(f"[dim]Executing against '{collection_name}': {query_params}[/dim]")
-        results = self.client.collections[collection_name].documents.search(query_params)
-        
+    def _render_results(self, results, include_fields, is_star, collection_name):
+        """Print a search response as a Rich table followed by the hit summary."""
         hits = results.get('hits', [])
         if not hits:
             console.print("[yellow]No results found.[/yellow]")
             return
 
-        if not hits: return
-
-        first_doc = hits[0]['document']
-        columns_to_show = include_fields if (include_fields and not is_star) else list(first_doc.keys())
-        
-        table = Table(box=box.ROUNDED)
+        # If explicit fields requested, use them. Else show every key of the first
+        # hit, ordered: id, then schema fields (cached order), then any other keys.
+        # The schema only orders columns; it never drops keys the document has.
+        if include_fields and not is_star:
+            columns_to_show = include_fields
+        else:
+            first_doc = hits[0]['document']
+            columns_to_show = ['id'] if 'id' in first_doc else []
+            for col in self.collection_fields.get(collection_name, []):
+                if col in first_doc and col != 'id':
+                    columns_to_show.append(col)
+            seen = set(columns_to_show)
+            columns_to_show.extend(k for k in first_doc if k not in seen)
+
+        # Rounded borders are drawn per row/cell; use a lighter style for big outputs
+        box_style = box.ROUNDED if len(hits) < SIMPLE_BOX_THRESHOLD else box.SIMPLE
+        table = Table(box=box_style)
         for col in columns_to_show:
             table.add_column(col, style="cyan")
-            
+
+        add_row = table.add_row
         for hit in hits:
             doc = hit['document']
-            row = [str(doc.get(col, '')) for col in columns_to_show]
-            table.add_row(*row)
-            
+            add_row(*[str(doc.get(col, '')) for col in columns_to_show])
+
         console.print(table)
         console.print(f"[dim]Found {results.get('found', 0)} hits in {results.get('search_time_ms', 0)}ms[/dim]")
 
-    def _transpile_where(self, node):
-        """Recursively translate SQLGlot expression to Typesense filter_by string."""
-        
-        # Handle binary operations: EQ, GT, LT, etc.
-        # Typesense: field:value, field:>value, field:[v1..v2]
-        
-        if isinstance(node, exp.And):
-            return f"{self._transpile_where(node.left)} && {self._transpile_where(node.right)}"
-        
-        if isinstance(node, exp.Or):
-            return f"{self._transpile_where(node.left)} || {self._transpile_where(node.right)}"
-        
-        # Comparison Operators
-        # node.this is usually column, node.expression is value
-        if isinstance(node, exp.EQ):
-            return f"{node.left.name}:={node.right.name}" # Using := for exact match in TS
-        if isinstance(node, exp.GT):
-            return f"{node.left.name}:>{node.right.name}"
-        if isinstance(node, exp.LT):
-            return f"{node.left.name}:<{node.right.name}"
-        if isinstance(node, exp.GTE):
-            return f"{node.left.name}:>={node.right.name}"
-        if isinstance(node, exp.LTE):
-            return f"{node.left.name}:<={node.right.name}"
-        if isinstance(node, exp.NEQ):
-            return f"{node.left.name}:!={node.right.name}"
-            
-        if isinstance(node, exp.Like):
-            # rudimentary LIKE support
-            # LIKE 'term' -> field:term (text match)
-            # LIKE '%term%' -> unsupported direct mapping in filter_by, usually 'q' param, 
-            # but here we are in filter_by context. 
-            # Typesense filter_by supports field:value for exact or string match.
-            return f"{node.this.name}:{node.expression.this}"
-
-        if isinstance(node, exp.Is):
-            # Handle IS NULL / IS NOT NULL
-            # node.this is the field
-            # node.expression is Null()
-            if isinstance(node.expression, exp.Null):
-                # Standard SQLGlot IS parser often keeps the NOT in parent structure or as a flag?
-                # Actually, sqlglot parses "x IS NOT NULL" as Not(Is(x, Null)).
-                # So we might encounter Is(x, Null) here.
-                return f"{node.this.name}:=null"
-        
-        if isinstance(node, exp.Not):
-            # Handle NOT (...)
-            # Specifically check for IS NULL inside NOT -> IS NOT NULL
-            if isinstance(node.this, exp.Is) and isinstance(node.this.expression, exp.Null):
-                 return f"{node.this.this.name}:!=null"
-            # Generic NOT mapping if possible, though TS uses negation differently often
-            # return f"!({self._transpile_where(node.this)})" 
-            # TS doesn't strictly have !(expression) syntax in filter_by, usually operators.
-            # But let's try the IS NOT NULL case specifically as requested.
-            
-        raise ValueError(f"Unsupported WHERE clause operator: {type(node)}")
-
     def execute_file(self, filename):
         """Execute commands from a JSON file."""
         if not filename:
@@ -544,8 +702,8 @@ class TypesenseCLI:
              return
              
         try:
-            with open(path, 'r') as f:
-                commands = json.load(f)
+            with open(path, 'rb' if _json_binary else 'r') as f:
+                commands = _json_loads(f.read())
                 
             if not isinstance(commands, list):
                 console.print("[bold red]Error:[/bold red] JSON file must contain a list of command strings.")
@@ -558,43 +716,31 @@ class TypesenseCLI:
                 else:
                     console.print(f"[yellow]Skipping non-string item: {cmd_str}[/yellow]")
                     
-        except json.JSONDecodeError as e:
+        except json.JSONDecodeError as e: # orjson.JSONDecodeError subclasses this
             console.print(f"[bold red]Error parsing JSON file:[/bold red] {e}")
         except Exception as e:
             console.print(f"[bold red]Error reading file:[/bold red] {e}")
 
     def process_command(self, text):
-        parts = text.split()
-        if not parts:
-            return True # Continue
-        
-        cmd_root = parts[0].strip()
-        args = parts[1:]
-
-        if cmd_root.startswith('\\'):
-             # Handle meta commands
-             if cmd_root == r'\q':
-                console.print("Bye!")
-                sys.exit(0)
-             elif cmd_root == r'\l':
-                self.do_list()
-             elif cmd_root == r'\c':
-                self.do_connect(args[0] if args else None)
-             elif cmd_root == r'\d':
-                target = args[0] if args else None
-                self.do_describe(target)
-             elif cmd_root == r'\s' or cmd_root == r'\stats':
-                target = args[0] if args else None
-                self.do_stats(target)
-             elif cmd_root == r'\?':
-                self.do_help()
-             elif cmd_root == r'\i':
-                self.execute_file(args[0] if args else None)
-             else:
-                 console.print(f"[red]Unknown command: {cmd_root}[/red]")
-        else:
+        """Run one input line; always returns True (keep reading input)."""
+        text = text.strip()
+        if not text:
+            return True
+
+        if text[0] != '\\':
              # Default behavior: Treat as SQL
              self.execute_sql(text)
+             return True
+
+        # Handle meta commands; only the (short) argument tail is split
+        cmd_root, *rest = text.split(None, 1)
+        args = rest[0].split() if rest else []
+        handler = self._meta_dispatch.get(cmd_root)
+        if handler is None:
+            console.print(f"[red]Unknown command: {cmd_root}[/red]")
+            return True
+        handler(args)
+        return True
 
     def run(self):
         self.do_help()